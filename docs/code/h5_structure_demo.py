@@ -6,6 +6,45 @@ import numpy as np
 import h5py
 import os
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, NumPy reductions are used instead
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _minmaxsum(flat):
+        """
+        Min, max and sum of a 1D array in one parallel pass
+        (the min/max loop vectorizes to SIMD on uint8 data)
+        """
+        mn = flat[0]
+        mx = flat[0]
+        sm = 0.0
+        for i in prange(flat.shape[0]):
+            v = flat[i]
+            mn = min(mn, v)
+            mx = max(mx, v)
+            sm += v
+        return mn, mx, sm
+else:
+    _minmaxsum = None
+
+
+def _minmaxmean(a):
+    """
+    Return (min, max, mean) of an array
+    One fused traversal with numba for integer data, three NumPy reductions
+    otherwise (NumPy propagates NaN and raises on empty arrays)
+    """
+    if _minmaxsum is None or a.size == 0 or not np.issubdtype(a.dtype, np.integer):
+        return a.min(), a.max(), a.mean()
+    flat = np.ascontiguousarray(a).reshape(-1)
+    mn, mx, sm = _minmaxsum(flat)
+    return mn, mx, sm / flat.size
+
+
 def demo_h5_structure():
     """
     Demonstrate H5 file structure and storage format using actual project data
@@ -62,32 +101,39 @@ def demo_h5_structure():
         print(f"\n[Step 3] Read Sample Data")
         print("-" * 80)
         
-        # Read first slice
-        first_slice = dataset[0, :, :]
+        # Read first, middle and last slices into one stacked buffer
+        D, H, W = dataset.shape
+        mid_idx = D // 2
+        idxs = np.array([0, mid_idx, D - 1])
+        buf = np.empty((len(idxs), H, W), dtype=dataset.dtype)
+        for k, i in enumerate(idxs):
+            dataset.read_direct(buf, np.s_[i, :, :], np.s_[k, :, :])
+        first_slice, mid_slice, last_slice = buf
+        
         print(f"First Slice (dataset[0, :, :]):")
         print(f"  Shape: {first_slice.shape}")
         print(f"  Data Type: {first_slice.dtype}")
-        print(f"  Value Range: [{first_slice.min()}, {first_slice.max()}]")
-        print(f"  Mean: {first_slice.mean():.2f}")
+        slice_min, slice_max, slice_mean = _minmaxmean(first_slice)
+        print(f"  Value Range: [{slice_min}, {slice_max}]")
+        print(f"  Mean: {slice_mean:.2f}")
         
         # Show top-left 10x10 region
         print(f"\nTop-left 10×10 region of first slice:")
         print(first_slice[:10, :10])
         
-        # Read middle slice
-        mid_idx = dataset.shape[0] // 2
-        mid_slice = dataset[mid_idx, :, :]
+        # Middle slice
         print(f"\nMiddle Slice (dataset[{mid_idx}, :, :]):")
         print(f"  Shape: {mid_slice.shape}")
-        print(f"  Value Range: [{mid_slice.min()}, {mid_slice.max()}]")
-        print(f"  Mean: {mid_slice.mean():.2f}")
+        slice_min, slice_max, slice_mean = _minmaxmean(mid_slice)
+        print(f"  Value Range: [{slice_min}, {slice_max}]")
+        print(f"  Mean: {slice_mean:.2f}")
         
-        # Read last slice
-        last_slice = dataset[-1, :, :]
+        # Last slice
         print(f"\nLast Slice (dataset[-1, :, :]):")
         print(f"  Shape: {last_slice.shape}")
-        print(f"  Value Range: [{last_slice.min()}, {last_slice.max()}]")
-        print(f"  Mean: {last_slice.mean():.2f}")
+        slice_min, slice_max, slice_mean = _minmaxmean(last_slice)
+        print(f"  Value Range: [{slice_min}, {slice_max}]")
+        print(f"  Mean: {slice_mean:.2f}")
         
         # Read full data (if not too large)
         print(f"\n[Step 4] Read Full 3D Array")
@@ -99,15 +145,30 @@ def demo_h5_structure():
             print(f"  Full Array Shape: {loaded_data.shape}")
             print(f"  Full Array Type: {type(loaded_data)}")
             print(f"  Full Array Data Type: {loaded_data.dtype}")
-            print(f"  Value Range: [{loaded_data.min()}, {loaded_data.max()}]")
-            print(f"  Mean: {loaded_data.mean():.2f}")
+            data_min, data_max, data_mean = _minmaxmean(loaded_data)
+            print(f"  Value Range: [{data_min}, {data_max}]")
+            print(f"  Mean: {data_mean:.2f}")
             print(f"  Median: {np.median(loaded_data):.2f}")
         else:
             print("Data size is large, reading statistics only...")
             print("  Computing statistics...")
-            min_val = dataset[:].min()
-            max_val = dataset[:].max()
-            mean_val = dataset[:].mean()
+            # Single streaming pass: each chunk is decompressed once and
+            # only one chunk is held in memory at a time
+            if dataset.chunks is not None:
+                blocks = dataset.iter_chunks()
+            else:
+                blocks = (np.s_[i:i + 64] for i in range(0, dataset.shape[0], 64))
+            acc_dtype = np.float64 if np.issubdtype(dataset.dtype, np.floating) else np.int64
+            min_val, max_val = None, None
+            total, count = 0, 0
+            for chunk_slice in blocks:
+                block = dataset[chunk_slice]
+                block_min, block_max = block.min(), block.max()
+                min_val = block_min if min_val is None else min(min_val, block_min)
+                max_val = block_max if max_val is None else max(max_val, block_max)
+                total += block.sum(axis=None, dtype=acc_dtype)
+                count += block.size
+            mean_val = total / count
             print(f"  Value Range: [{min_val}, {max_val}]")
             print(f"  Mean: {mean_val:.2f}")
         
@@ -182,6 +243,14 @@ def demo_h5_structure():
     2. Save to H5:
        with h5py.File("cropped_volume_ROI.h5", "w") as f:
            f.create_dataset("data", data=d_slice_cropped_array.astype(np.uint8), compression="gzip")
+
+       Recommended writer change (not applied in preprocess.py yet):
+           f.create_dataset("data", data=d_slice_cropped_array.astype(np.uint8),
+                            chunks=(1, crop_h, crop_w), compression="lzf")
+       # lzf decompresses much faster than gzip for a slightly larger file;
+       # blosc lz4 + shuffle (via hdf5plugin) is a faster alternative:
+       #   compression=32001, compression_opts=(0, 0, 0, 0, 5, 1, 1)
+       # chunks=(1, H, W) makes every Z slice read exactly one chunk
     
     3. H5 file content:
        - A 3D NumPy array
@@ -3,29 +3,54 @@
 Slice caching and prefetching module
 Implements LRU Cache and prefetching optimizations
 """
+import threading
 from collections import OrderedDict
-from typing import Optional, Tuple
+from typing import Optional
 import numpy as np
 
 
+# Cache keys pack (axis, slice_idx) into one int: (axis << 24) | slice_idx,
+# valid for slice_idx < 2**24. Cheaper to build and hash than a tuple.
+_AXIS_SHIFT = 24
+
+
 class SliceCache:
     """
     LRU Cache implementation - cache recently accessed slices
     Implemented with OrderedDict, most recently used at the end,
     oldest at the front.
+    
+    Cached slices are stored and returned as read-only views instead of
+    copies. Callers that need to modify a returned slice must .copy() it
+    first, and producers must not modify an array after putting it.
+    
+    All operations are guarded by a lock, so the prefetch worker thread can
+    put slices while the UI thread reads them.
+    
+    Keys are (axis << 24) | slice_idx ints, so slice indices must be < 2**24.
+    
+    The cache can also be bounded by memory: XY, XZ and YZ planes differ in
+    size, so a byte budget gives predictable memory use. When both bounds
+    are set, the tighter one applies. The budget counts each slice's own
+    nbytes, so producers should not put views into larger arrays.
     """
     
-    def __init__(self, max_size: int = 20):
+    def __init__(self, max_size: int = 20, max_bytes: Optional[int] = None):
         """
         Initialize the LRU cache.
         
         Args:
             max_size: Maximum number of slices to cache.
+            max_bytes: Maximum total size of cached slices in bytes
+                       (None = bounded by max_size only).
         """
-        self.cache: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        self.cache: OrderedDict[int, np.ndarray] = OrderedDict()
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._bytes = 0  # total nbytes of cached slices
         self.hits = 0    # cache hit count
         self.misses = 0  # cache miss count
+        self._lock = threading.Lock()
     
     def get(self, axis: int, slice_idx: int) -> Optional[np.ndarray]:
         """
@@ -36,17 +61,33 @@ class SliceCache:
             slice_idx: Slice index.
             
         Returns:
-            Cached slice data, or None if it does not exist.
+            Cached slice data (read-only view), or None if it does not exist.
         """
-        key = (axis, slice_idx)
-        if key in self.cache:
+        key = (axis << _AXIS_SHIFT) | slice_idx
+        with self._lock:
+            try:
+                data = self.cache[key]  # single lookup instead of `in` + `[]`
+            except KeyError:
+                self.misses += 1
+                return None
             # Hit: move to end to mark as most recently used
             self.cache.move_to_end(key)
             self.hits += 1
-            return self.cache[key].copy()  # return a copy to avoid external modification
-        else:
-            self.misses += 1
-            return None
+            return data  # write-protected, no copy needed
+    
+    def touch(self, axis: int, slice_idx: int) -> bool:
+        """
+        Mark a cached slice as most recently used, without counting a hit or miss.
+        
+        Returns:
+            True if the slice is cached.
+        """
+        key = (axis << _AXIS_SHIFT) | slice_idx
+        with self._lock:
+            if key not in self.cache:
+                return False
+            self.cache.move_to_end(key)
+            return True
     
     def put(self, axis: int, slice_idx: int, data: np.ndarray):
         """
@@ -57,24 +98,38 @@ class SliceCache:
             slice_idx: Slice index.
             data: Slice data.
         """
-        key = (axis, slice_idx)
+        key = (axis << _AXIS_SHIFT) | slice_idx
         
-        # If it already exists, reorder it (will be updated below)
-        if key in self.cache:
-            self.cache.move_to_end(key)
-        else:
-            # If cache is full, remove the oldest item (front)
-            if len(self.cache) >= self.max_size:
-                self.cache.popitem(last=False)  # last=False means pop from the front
+        # Make a read-only view (no copy for contiguous input) outside the
+        # lock; the caller's own array stays writeable
+        arr = np.ascontiguousarray(data).view()
+        arr.flags.writeable = False
         
-        # Add new data at the end
-        self.cache[key] = data.copy()  # store a copy
+        with self._lock:
+            # If it already exists, drop the old data (re-added at the end)
+            old = self.cache.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            
+            # Add new data at the end
+            self.cache[key] = arr
+            self._bytes += arr.nbytes
+            
+            # While over either bound, remove the oldest items (front),
+            # always keeping the slice just added
+            while len(self.cache) > 1 and (
+                    len(self.cache) > self.max_size
+                    or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, evicted = self.cache.popitem(last=False)  # last=False means pop from the front
+                self._bytes -= evicted.nbytes
     
     def clear(self):
         """Clear the cache."""
-        self.cache.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
     
     def get_stats(self) -> dict:
         """
@@ -83,19 +138,23 @@ class SliceCache:
         Returns:
             A dict containing statistics such as hit rate.
         """
-        total = self.hits + self.misses
-        hit_rate = (self.hits / total * 100) if total > 0 else 0.0
-        return {
-            'size': len(self.cache),
-            'max_size': self.max_size,
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': hit_rate,
-            'total_requests': total
-        }
+        with self._lock:
+            total = self.hits + self.misses
+            hit_rate = (self.hits / total * 100) if total > 0 else 0.0
+            return {
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'bytes_used': self._bytes,
+                'bytes_max': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate,
+                'total_requests': total
+            }
     
     def remove(self, axis: int, slice_idx: int):
         """Remove a specific cache entry."""
-        key = (axis, slice_idx)
-        if key in self.cache:
-            del self.cache[key]
+        with self._lock:
+            data = self.cache.pop((axis << _AXIS_SHIFT) | slice_idx, None)
+            if data is not None:
+                self._bytes -= data.nbytes
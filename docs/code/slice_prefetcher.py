@@ -3,10 +3,89 @@
 Slice prefetch module
 Use QThread to prefetch neighboring slices in the background.
 """
+import atexit
+import queue
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 import h5py
 import numpy as np
-from typing import Optional, List, Tuple
-from PySide6.QtCore import QThread, Signal, QObject
+import shiboken6
+from typing import Optional, List, Tuple, Callable, Dict
+from PySide6.QtCore import QThread, Signal, QObject, QMetaMethod, QCoreApplication
+from slice_cache import SliceCache
+
+
+# Bounds for the tuned HDF5 raw data chunk cache (h5py default is 1 MB)
+_MIN_RDCC_NBYTES = 1024 * 1024
+_MAX_RDCC_NBYTES = 512 * 1024 * 1024
+# Largest chunk extent (in slices) that is prefetched as whole chunks;
+# larger chunks fall back to the plain +/- prefetch_range window
+_MAX_CHUNK_PREFETCH = 32
+
+
+def _next_prime(n: int) -> int:
+    """Return the smallest prime >= n (used for rdcc_nslots)."""
+    n = max(n, 2)
+    while True:
+        if all(n % d for d in range(2, int(n ** 0.5) + 1)):
+            return n
+        n += 1
+
+
+def _coalesce_offsets(current_idx: int, offsets: List[int]) -> List[Tuple[int, int]]:
+    """
+    Merge slice offsets into contiguous (lo, hi) index ranges.
+    
+    Forward ranges come first (nearest first), then backward ranges
+    (nearest first), e.g. current_idx=10, [+1, -1, +2, -2] -> [(11, 12), (8, 9)].
+    """
+    ranges: List[Tuple[int, int]] = []
+    forward = sorted(o for o in set(offsets) if o > 0)
+    backward = sorted((o for o in set(offsets) if o < 0), reverse=True)
+    for side, step in ((forward, 1), (backward, -1)):
+        run_start = None
+        for i, offset in enumerate(side):
+            if run_start is None:
+                run_start = offset
+            if i + 1 == len(side) or side[i + 1] != offset + step:
+                lo, hi = sorted((current_idx + run_start, current_idx + offset))
+                ranges.append((lo, hi))
+                run_start = None
+    return ranges
+
+
+def _chunk_aligned_ranges(current_idx: int, chunk_len: int, direction: int,
+                          prefetch_range: int) -> List[Tuple[int, int]]:
+    """
+    Build whole-chunk (lo, hi) ranges around current_idx along one axis.
+    
+    The chunk containing current_idx comes first, split around current_idx
+    (which is already displayed), ahead of it before behind it. The adjacent
+    chunk in the scroll direction (+1/-1) is added only when current_idx is
+    within prefetch_range of that boundary. Offsets within +/- prefetch_range
+    not covered by those chunks are appended as coalesced ranges.
+    e.g. chunk_len=8, direction=+1, prefetch_range=2:
+    current_idx=10 -> [(11, 15), (8, 9)],
+    current_idx=14 -> [(15, 15), (8, 13), (16, 23)].
+    """
+    chunk_start = (current_idx // chunk_len) * chunk_len
+    chunk_end = chunk_start + chunk_len - 1
+    parts = [(current_idx + 1, chunk_end), (chunk_start, current_idx - 1)]
+    if direction < 0:
+        parts.reverse()
+    ranges = [(lo, hi) for lo, hi in parts if lo <= hi]
+    
+    ahead = current_idx + direction * prefetch_range
+    if not chunk_start <= ahead < chunk_start + chunk_len:
+        next_start = chunk_start + direction * chunk_len
+        ranges.append((next_start, next_start + chunk_len - 1))
+    
+    covered_lo = min([chunk_start] + [lo for lo, _ in ranges])
+    covered_hi = max([chunk_end] + [hi for _, hi in ranges])
+    extra = [o for i in range(1, prefetch_range + 1) for o in (i, -i)
+             if not covered_lo <= current_idx + o <= covered_hi]
+    return ranges + _coalesce_offsets(current_idx, extra)
 
 
 class SlicePrefetchWorker(QThread):
@@ -14,210 +93,653 @@ class SlicePrefetchWorker(QThread):
     Background thread: prefetch slice data.
     Inherits from QThread, performs I/O in the background
     without blocking the UI.
+    
+    The thread is long-lived: run() serves prefetch requests from a queue
+    until shutdown(), so the H5 file is opened once instead of per scroll.
+    
+    With a shared SliceCache, slices are put into the cache from this
+    thread and only slice_ready(axis, slice_idx) is emitted, so the arrays
+    are not queued through Qt. Without one, slices_prefetched carries the
+    data, once per coalesced range rather than once per slice. The per-slice
+    slice_prefetched signal is still emitted for existing consumers, but
+    only while something is connected to it.
+    
+    With parallel_io, the Y/X slabs of one request are read concurrently
+    by a small thread pool. h5py serializes calls on its global lock, so
+    this mainly overlaps the page-cache reads of memory-mapped files.
+    
+    With a zslab_cache_nbytes budget, Y/X planes of chunked datasets are cut
+    from Z-slabs (full chunk rows along axis 0, decompressed once and kept
+    in RAM until close_file) instead of being read from HDF5 per request,
+    which otherwise decompresses every z-chunk again.
     """
     
-    # Signal: slice prefetch completed
+    # Signal: slice range prefetch completed
+    slices_prefetched = Signal(int, np.ndarray, np.ndarray)  # axis, slice indices, stacked data
+    # Signal: single slice prefetch completed (compatibility, see slices_prefetched)
     slice_prefetched = Signal(int, int, np.ndarray)  # axis, slice_idx, data
+    # Signal: slice prefetched into the shared cache
+    slice_ready = Signal(int, int)  # axis, slice_idx
     # Signal: prefetch error
     prefetch_error = Signal(str)  # error_message
     
-    def __init__(self, h5_file_path: str, dataset_key: str = 'data'):
+    def __init__(self, h5_file_path: str, dataset_key: str = 'data',
+                 rdcc_nbytes: Optional[int] = None,
+                 cache: Optional[SliceCache] = None,
+                 parallel_io: bool = False,
+                 zslab_cache_nbytes: int = 0):
         """
         Initialize the prefetch worker thread.
         
         Args:
             h5_file_path: Path to the H5 file.
             dataset_key: Dataset key name.
+            rdcc_nbytes: Size of the HDF5 chunk cache in bytes.
+                         None = derive it from the dataset chunk layout.
+            cache: Shared slice cache to prefetch into (None = emit the
+                   data through slices_prefetched instead).
+            parallel_io: Read the slabs of axis 1/2 requests concurrently
+                         (ignored on MPI builds of HDF5).
+            zslab_cache_nbytes: Memory budget of the Z-slab cache. A Y/X plane
+                                needs every Z-slab, so the cache is used only
+                                if the whole dataset fits (0 = disabled,
+                                the default).
         """
         super().__init__()
         self.h5_file_path = h5_file_path
         self.dataset_key = dataset_key
+        self.rdcc_nbytes = rdcc_nbytes
+        self.cache = cache
+        self.zslab_cache_nbytes = zslab_cache_nbytes
         self.h5_file: Optional[h5py.File] = None
         self.dataset: Optional[h5py.Dataset] = None
-        self._stop_requested = False
+        # Request generation: bumped by submit()/stop() (UI thread), a request
+        # stops as soon as it no longer matches the value it was queued with
+        self._generation = 0
         
-        # Prefetch parameters (set externally)
-        self.axis = 0
-        self.current_idx = 0
-        self.prefetch_list: List[int] = []
+        # Dataset properties cached by open_file (avoid per-read HDF5 calls)
+        self._shape: Tuple[int, ...] = ()
+        self._dtype: Optional[np.dtype] = None
+        self._chunks: Optional[Tuple[int, ...]] = None
+        # Memory map of a contiguous, uncompressed dataset (bypasses h5py)
+        self._mm: Optional[np.memmap] = None
+        
+        # Decompressed Z-slabs (z0 -> data[z0:z0 + chunks[0]]) for Y/X planes,
+        # filled lazily; the lock guards fills from parallel_io threads
+        self._use_zslabs = False
+        self._zslabs: Dict[int, np.ndarray] = {}
+        self._zslab_lock = threading.Lock()
+        
+        # Reusable read_direct staging buffers for strided Y/X slabs
+        # (axis -> free buffers); one is taken per in-flight read
+        self._staging: Dict[int, List[np.ndarray]] = {}
+        self._staging_lock = threading.Lock()
+        
+        # Slab reader per axis (0=Z, 1=Y, 2=X), built by open_file
+        self._readers: List[Callable[[int, int], np.ndarray]] = []
+        
+        # Pending prefetch requests: (axis, current_idx, prefetch_ranges),
+        # None is the shutdown sentinel
+        self._queue: queue.Queue = queue.Queue()
+        self._shutdown = False
+        
+        # Parallel (MPI) builds of HDF5 are not thread-safe
+        self.parallel_io = parallel_io and not h5py.get_config().mpi
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.parallel_io:
+            self._executor = ThreadPoolExecutor(max_workers=4,
+                                                thread_name_prefix='slice-io')
     
     def open_file(self):
-        """Open the H5 file (call in main thread)."""
+        """
+        Open the H5 file (call in main thread).
+        
+        The file is first opened with the default chunk cache to inspect
+        the dataset layout, then reopened with a chunk cache large enough
+        to keep a full plane of chunks resident between prefetches.
+        """
         try:
             self.h5_file = h5py.File(self.h5_file_path, 'r')
-            if self.dataset_key in self.h5_file:
-                self.dataset = self.h5_file[self.dataset_key]
-            else:
-                # Try to find the first 3D dataset
-                for key in self.h5_file.keys():
-                    if isinstance(self.h5_file[key], h5py.Dataset) and len(self.h5_file[key].shape) == 3:
-                        self.dataset = self.h5_file[key]
-                        break
+            self.dataset = self._find_dataset(self.h5_file)
+            
+            if self.dataset is not None and self.dataset.chunks is not None:
+                self._use_zslabs = 0 < self.dataset.nbytes <= self.zslab_cache_nbytes
+                rdcc_nbytes, rdcc_nslots = self._chunk_cache_params(self.dataset)
+                self.h5_file.close()
+                self.h5_file = h5py.File(self.h5_file_path, 'r',
+                                         rdcc_nbytes=rdcc_nbytes,
+                                         rdcc_nslots=rdcc_nslots,
+                                         rdcc_w0=0.75)
+                self.dataset = self._find_dataset(self.h5_file)
+            
+            if self.dataset is not None:
+                self._shape = self.dataset.shape
+                self._dtype = self.dataset.dtype
+                self._chunks = self.dataset.chunks
+                self._mm = self._map_contiguous(self.dataset)
+                self._readers = [self._block_reader(axis) for axis in range(3)]
         except Exception as e:
             self.prefetch_error.emit(f"Failed to open H5 file: {e}")
     
+    @property
+    def chunks(self) -> Optional[Tuple[int, ...]]:
+        """Chunk shape of the opened dataset (None if contiguous or not open)."""
+        return self._chunks
+    
+    def _find_dataset(self, h5_file: h5py.File) -> Optional[h5py.Dataset]:
+        """Return the dataset under dataset_key, or the first 3D dataset."""
+        if self.dataset_key in h5_file:
+            return h5_file[self.dataset_key]
+        # Try to find the first 3D dataset
+        for key in h5_file.keys():
+            if isinstance(h5_file[key], h5py.Dataset) and len(h5_file[key].shape) == 3:
+                return h5_file[key]
+        return None
+    
+    def _map_contiguous(self, dataset: h5py.Dataset) -> Optional[np.memmap]:
+        """
+        Memory-map the raw data of a contiguous, uncompressed dataset.
+        
+        Returns:
+            A read-only np.memmap with the dataset shape, or None if the
+            dataset is chunked/compressed, external or not yet allocated
+            (the h5py read path is used in that case).
+        """
+        if dataset.chunks is not None or dataset.compression is not None:
+            return None
+        if dataset.external is not None or dataset.size == 0:
+            return None
+        offset = dataset.id.get_offset()
+        if offset is None:  # storage not allocated
+            return None
+        return np.memmap(self.h5_file_path, dtype=dataset.dtype, mode='r',
+                         offset=offset, shape=dataset.shape)
+    
+    def _chunk_cache_params(self, dataset: h5py.Dataset) -> Tuple[int, int]:
+        """
+        Compute (rdcc_nbytes, rdcc_nslots) for a chunked dataset.
+        
+        A plane along one axis touches every chunk spanned by the two other
+        axes, so the cache is sized for the worst of the three axes (only
+        axis 0 when Y/X planes are served from Z-slabs).
+        rdcc_nslots is a prime about 100x the number of cached chunks.
+        """
+        chunk_nbytes = int(np.prod(dataset.chunks)) * dataset.dtype.itemsize
+        chunks_per_dim = [-(-n // c) for n, c in zip(dataset.shape, dataset.chunks)]
+        
+        if self.rdcc_nbytes is not None:
+            rdcc_nbytes = self.rdcc_nbytes
+        else:
+            total_chunks = int(np.prod(chunks_per_dim))
+            axes = (0,) if self._use_zslabs else (0, 1, 2)
+            chunks_per_plane = max(total_chunks // chunks_per_dim[a] for a in axes)
+            rdcc_nbytes = chunks_per_plane * chunk_nbytes
+            rdcc_nbytes = min(max(rdcc_nbytes, _MIN_RDCC_NBYTES), _MAX_RDCC_NBYTES)
+        
+        cached_chunks = max(rdcc_nbytes // chunk_nbytes, 1)
+        return rdcc_nbytes, _next_prime(100 * cached_chunks)
+    
     def close_file(self):
         """Close the H5 file."""
         if self.h5_file is not None:
             self.h5_file.close()
             self.h5_file = None
             self.dataset = None
+            self._shape = ()
+            self._dtype = None
+            self._chunks = None
+            self._mm = None
+            self._use_zslabs = False
+            self._zslabs.clear()
+            self._staging.clear()
+            self._readers = []
     
-    def prefetch_slices(self, axis: int, current_idx: int, prefetch_list: List[int]):
+    def _zslab(self, z0: int) -> np.ndarray:
+        """Return the decompressed Z-slab starting at z0, reading it on first use."""
+        with self._zslab_lock:
+            slab = self._zslabs.get(z0)
+            if slab is None:
+                z1 = min(z0 + self._chunks[0], self._shape[0])
+                slab = np.empty((z1 - z0,) + tuple(self._shape[1:]), dtype=self._dtype)
+                self.dataset.read_direct(slab, source_sel=np.s_[z0:z1, :, :])
+                self._zslabs[z0] = slab
+            return slab
+    
+    def _take_staging(self, axis: int, n: int) -> np.ndarray:
+        """Take a free staging buffer holding >= n slices along axis (or allocate one)."""
+        with self._staging_lock:
+            free = self._staging.setdefault(axis, [])
+            buf = free.pop() if free else None
+        if buf is None or buf.shape[axis] < n:
+            buf_shape = list(self._shape)
+            buf_shape[axis] = n
+            buf = np.empty(buf_shape, dtype=self._dtype)
+        return buf
+    
+    def _give_staging(self, axis: int, buf: np.ndarray):
+        """Return a staging buffer for reuse by the next read on this axis."""
+        with self._staging_lock:
+            self._staging.setdefault(axis, []).append(buf)
+    
+    def _block_reader(self, axis: int) -> Callable[[int, int], np.ndarray]:
         """
-        Prefetch the specified list of slices (executed in the thread).
+        Build the slab reader for an axis (once per file, in open_file).
         
         Args:
             axis: Axis (0=Z, 1=Y, 2=X).
-            current_idx: Current slice index.
-            prefetch_list: List of slice offsets to prefetch
-                           (relative to current_idx).
+            
+        Returns:
+            read(lo, hi) returning the consecutive slices lo..hi (inclusive)
+            as a slab with the slices along its first axis: one HDF5 call
+            into a freshly allocated array (axis 0) or into a reused staging
+            buffer copied out to contiguous planes (axes 1/2), or, for
+            contiguous uncompressed data, a view of the memory-mapped file
+            (copied to contiguous planes for axes 1/2). Y/X planes of chunked
+            data are cut from the Z-slab cache when it is enabled.
         """
-        if self.dataset is None:
-            return
+        ds = self.dataset
+        mm = self._mm
+        shape = self._shape
+        dtype = self._dtype
+        # 0: [lo:hi+1, :, :] (XY planes), 1: [:, lo:hi+1, :] (XZ planes),
+        # 2: [:, :, lo:hi+1] (YZ planes)
+        lead = (slice(None),) * axis
         
-        self._stop_requested = False
+        if mm is not None:
+            # Uncompressed contiguous data: a view into the mapped file,
+            # actual I/O happens through the OS page cache. Strided Y/X
+            # planes are gathered here (NumPy releases the GIL for the copy)
+            def read_mapped(lo: int, hi: int) -> np.ndarray:
+                planes = np.moveaxis(mm[lead + (slice(lo, hi + 1),)], axis, 0)
+                return planes if axis == 0 else np.ascontiguousarray(planes)
+            return read_mapped
         
-        try:
-            shape = self.dataset.shape
-            max_idx = shape[axis] - 1
+        if self._use_zslabs and axis != 0:
+            # Y/X planes from cached Z-slabs: every chunk is decompressed
+            # once per file instead of once per request
+            depth, step = shape[0], self._chunks[0]
+            plane_shape = tuple(n for i, n in enumerate(shape) if i != axis)
             
-            for offset in prefetch_list:
-                if self._stop_requested:
-                    break
-                
-                target_idx = current_idx + offset
-                if 0 <= target_idx <= max_idx:
-                    # Extract slice based on axis
-                    if axis == 0:  # Z axis (XY plane)
-                        slice_data = self.dataset[target_idx, :, :]
-                    elif axis == 1:  # Y axis (XZ plane)
-                        slice_data = self.dataset[:, target_idx, :]
-                    elif axis == 2:  # X axis (YZ plane)
-                        slice_data = self.dataset[:, :, target_idx]
-                    else:
-                        continue
-                    
-                    # Convert to NumPy array and emit signal
-                    slice_array = np.array(slice_data)
-                    self.slice_prefetched.emit(axis, target_idx, slice_array)
+            def read_zslabs(lo: int, hi: int) -> np.ndarray:
+                planes = np.empty((hi - lo + 1,) + plane_shape, dtype=dtype)
+                for z0 in range(0, depth, step):
+                    slab = self._zslab(z0)
+                    part = slab[lead + (slice(lo, hi + 1),)]
+                    planes[:, z0:z0 + slab.shape[0]] = np.moveaxis(part, axis, 0)
+                return planes
+            return read_zslabs
         
-        except Exception as e:
-            self.prefetch_error.emit(f"Prefetch error: {e}")
+        if axis != 0:
+            # Strided Y/X planes must be copied to contiguous planes anyway,
+            # so HDF5 reads into a reused staging buffer instead of a new one
+            def read_staged(lo: int, hi: int) -> np.ndarray:
+                n = hi - lo + 1
+                buf = self._take_staging(axis, n)
+                try:
+                    ds.read_direct(buf, source_sel=lead + (slice(lo, hi + 1),),
+                                   dest_sel=lead + (slice(0, n),))
+                    return np.ascontiguousarray(np.moveaxis(buf[lead + (slice(0, n),)], axis, 0))
+                finally:
+                    self._give_staging(axis, buf)
+            return read_staged
+        
+        def read(lo: int, hi: int) -> np.ndarray:
+            # Z planes are handed out without copying, so the slab is fresh
+            block = np.empty((hi - lo + 1,) + tuple(shape[1:]), dtype=dtype)
+            ds.read_direct(block, source_sel=np.s_[lo:hi + 1, :, :])
+            return block
+        
+        return read
     
-    def run(self):
-        """Thread entry point: execute prefetch task."""
-        if self.dataset is None:
+    def _plan_cached(self, axis: int, current_idx: int,
+                     ranges: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], set]:
+        """
+        Pick the slices of a request that go into the shared cache.
+        
+        At most as many slices as the cache holds are kept, nearest to
+        current_idx first, so whole-chunk ranges cannot push the nearest
+        neighbours out. Kept slices that are already cached are only marked
+        as recently used; ranges are trimmed to the slices still missing.
+        
+        Returns:
+            (ranges to read, slice indices to put).
+        """
+        cache = self.cache
+        capacity = cache.max_size
+        if cache.max_bytes is not None:
+            plane_nbytes = int(np.prod([n for i, n in enumerate(self._shape) if i != axis]))
+            plane_nbytes *= self._dtype.itemsize
+            capacity = min(capacity, max(cache.max_bytes // max(plane_nbytes, 1), 1))
+        
+        wanted = sorted({i for lo, hi in ranges for i in range(lo, hi + 1)},
+                        key=lambda i: (abs(i - current_idx), i < current_idx))[:capacity]
+        missing = set()
+        for slice_idx in wanted:
+            if not cache.touch(axis, slice_idx):
+                missing.add(slice_idx)
+        
+        trimmed = []
+        for lo, hi in ranges:
+            todo = [i for i in range(lo, hi + 1) if i in missing]
+            if todo:
+                trimmed.append((todo[0], todo[-1]))
+        return trimmed, missing
+    
+    def _prefetch_ranges(self, axis: int, current_idx: int,
+                         prefetch_ranges: List[Tuple[int, int]],
+                         generation: Optional[int] = None):
+        """
+        Read each range as one slab and hand it to the consumer.
+        
+        Without a cache the slab is emitted with one slices_prefetched signal.
+        With a cache its slices are put one by one, nearest to current_idx
+        first (forward before backward at equal distance), limited to what
+        the cache can hold and skipping slices it already has. The request
+        is abandoned once submit()/stop() move on from its generation
+        (None = the current one).
+        """
+        if self.dataset is None or not 0 <= axis < len(self._readers):
             return
         
-        self._stop_requested = False
+        read = self._readers[axis]
+        if generation is None:
+            generation = self._generation
+        
+        cache = self.cache
+        futures = None
+        consumed = 0  # futures whose result this loop has taken
         
         try:
-            shape = self.dataset.shape
-            max_idx = shape[self.axis] - 1
+            max_idx = self._shape[axis] - 1
+            ranges = [(max(lo, 0), min(hi, max_idx)) for lo, hi in prefetch_ranges]
+            ranges = [(lo, hi) for lo, hi in ranges if lo <= hi]
+            if cache is not None:
+                ranges, missing = self._plan_cached(axis, current_idx, ranges)
+            
+            # Axis 0 slabs are contiguous in the file, read one at a time;
+            # strided Y/X slabs are submitted together when parallel_io is on
+            if self._executor is not None and axis != 0 and len(ranges) > 1:
+                futures = [self._executor.submit(read, lo, hi) for lo, hi in ranges]
             
-            for offset in self.prefetch_list:
-                if self._stop_requested:
-                    break
+            for n, (lo, hi) in enumerate(ranges):
+                if self._generation != generation:
+                    break  # cancelled or superseded by a newer request
+                
+                consumed = n + 1
+                block = futures[n].result() if futures is not None else read(lo, hi)
+                
+                if cache is None:
+                    # One signal per range; planes stacked along the first axis
+                    self.slices_prefetched.emit(axis, np.arange(lo, hi + 1),
+                                                np.ascontiguousarray(block))
+                    if self.isSignalConnected(QMetaMethod.fromSignal(self.slice_prefetched)):
+                        for k in range(hi - lo + 1):
+                            self.slice_prefetched.emit(axis, lo + k, np.array(block[k]))
+                    continue
                 
-                target_idx = self.current_idx + offset
-                if 0 <= target_idx <= max_idx:
-                    # Extract slice based on axis
-                    if self.axis == 0:  # Z axis (XY plane)
-                        slice_data = self.dataset[target_idx, :, :]
-                    elif self.axis == 1:  # Y axis (XZ plane)
-                        slice_data = self.dataset[:, target_idx, :]
-                    elif self.axis == 2:  # X axis (YZ plane)
-                        slice_data = self.dataset[:, :, target_idx]
-                    else:
-                        continue
-                    
-                    # Convert to NumPy array and emit signal
-                    slice_array = np.array(slice_data)
-                    self.slice_prefetched.emit(self.axis, target_idx, slice_array)
+                order = sorted((i for i in range(lo, hi + 1) if i in missing),
+                               key=lambda i: (abs(i - current_idx), i < current_idx))
+                # A view of a multi-plane slab would keep the whole slab alive
+                # behind the cache's byte budget, so such planes are copied;
+                # single-plane slabs and file views are cached as they are
+                copy = block.shape[0] > 1 and not isinstance(block, np.memmap)
+                for target_idx in order:
+                    if self._generation != generation:
+                        break
+                    plane = block[target_idx - lo]
+                    cache.put(axis, target_idx, plane.copy() if copy else np.ascontiguousarray(plane))
+                    self.slice_ready.emit(axis, target_idx)
         
         except Exception as e:
             self.prefetch_error.emit(f"Prefetch error: {e}")
+        
+        finally:
+            if futures is not None:
+                for future in futures[consumed:]:
+                    # Drop reads not started yet; report failures of the others
+                    if not future.cancel():
+                        future.add_done_callback(self._report_abandoned)
+    
+    def _report_abandoned(self, future):
+        """Emit prefetch_error for a failed pool read whose result nobody takes."""
+        if not future.cancelled() and future.exception() is not None:
+            self.prefetch_error.emit(f"Prefetch error: {future.exception()}")
+    
+    def prefetch_slices(self, axis: int, current_idx: int, prefetch_list: List[int]):
+        """
+        Prefetch the specified list of slices (executed in the thread).
+        
+        Args:
+            axis: Axis (0=Z, 1=Y, 2=X).
+            current_idx: Current slice index.
+            prefetch_list: List of slice offsets to prefetch
+                           (relative to current_idx).
+        """
+        self._prefetch_ranges(axis, current_idx, _coalesce_offsets(current_idx, prefetch_list))
+    
+    def submit(self, axis: int, current_idx: int, prefetch_ranges: List[Tuple[int, int]]):
+        """
+        Queue a prefetch request, cancelling the one in progress (if any).
+        
+        Args:
+            axis: Axis (0=Z, 1=Y, 2=X).
+            current_idx: Current slice index.
+            prefetch_ranges: (lo, hi) slice index ranges, inclusive.
+        """
+        self.stop()
+        self._queue.put((axis, current_idx, prefetch_ranges, self._generation))
+    
+    def run(self):
+        """Thread entry point: serve prefetch requests until shutdown()."""
+        while not self._shutdown:
+            request = self._queue.get()
+            if request is None:  # shutdown sentinel
+                break
+            self._prefetch_ranges(*request)
     
     def stop(self):
-        """Request the prefetching to stop."""
-        self._stop_requested = True
+        """Request the current prefetch to stop and drop pending ones."""
+        self._generation += 1
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def shutdown(self, wait: bool = False):
+        """
+        Stop prefetching and let run() return (the thread then finishes).
+        
+        Args:
+            wait: Block until the thread and any running pool reads are done,
+                  so the H5 file can be closed safely afterwards.
+        """
+        self._shutdown = True
+        self.stop()
+        self._queue.put(None)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if wait:
+            self.wait()  # returns once the current slab read is done
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+
+# Workers started by SlicePrefetcher and not stopped yet
+_live_workers: "weakref.WeakSet[SlicePrefetchWorker]" = weakref.WeakSet()
+
+
+def _stop_worker(worker: SlicePrefetchWorker):
+    """Stop a worker thread, wait for its reads and close its H5 file."""
+    _live_workers.discard(worker)
+    if not shiboken6.isValid(worker):  # already deleted
+        return
+    worker.shutdown(wait=True)
+    worker.close_file()
+
+
+@atexit.register
+def _stop_live_workers():
+    """Stop workers left running at interpreter exit, before Qt objects are torn down."""
+    for worker in list(_live_workers):
+        _stop_worker(worker)
 
 
 class SlicePrefetcher(QObject):
     """
     Slice prefetch manager.
     Manages the worker thread and provides a higher-level interface.
+    
+    The worker lives until cleanup(), so consumers connect once to the
+    signals below instead of to worker signals after every
+    start_prefetching() call: a connection made to worker.slice_prefetched
+    per call now stays for the worker's whole lifetime, so such handlers
+    pile up. If cleanup() is not called, the worker is stopped when the
+    prefetcher is destroyed, the application quits or the interpreter exits.
     """
     
-    def __init__(self, h5_file_path: str, dataset_key: str = 'data'):
+    # Signal: slice prefetched (data through Qt, no shared cache)
+    slice_prefetched = Signal(int, int, np.ndarray)  # axis, slice_idx, data
+    # Signal: slice prefetched into the shared cache
+    slice_ready = Signal(int, int)  # axis, slice_idx
+    # Signal: prefetch error
+    prefetch_error = Signal(str)  # error_message
+    
+    def __init__(self, h5_file_path: str, dataset_key: str = 'data',
+                 rdcc_nbytes: Optional[int] = None,
+                 cache: Optional[SliceCache] = None,
+                 parallel_io: bool = False,
+                 zslab_cache_nbytes: int = 0,
+                 parent: Optional[QObject] = None):
         """
         Initialize the prefetch manager.
         
         Args:
             h5_file_path: Path to the H5 file.
             dataset_key: Dataset key name.
+            rdcc_nbytes: HDF5 chunk cache size passed to the worker
+                         (None = tuned from the dataset chunk layout).
+            cache: Shared slice cache the worker prefetches into; the UI
+                   reads it on _on_ready (None = data via _on_prefetched).
+            parallel_io: Let the worker read axis 1/2 slabs concurrently.
+            zslab_cache_nbytes: Memory budget of the worker's Z-slab cache
+                                for Y/X planes (0 = disabled, the default).
+            parent: Parent QObject; the worker is stopped when it is destroyed.
         """
-        super().__init__()
+        super().__init__(parent)
         self.h5_file_path = h5_file_path
         self.dataset_key = dataset_key
+        self.rdcc_nbytes = rdcc_nbytes
+        self.cache = cache
+        self.parallel_io = parallel_io
+        self.zslab_cache_nbytes = zslab_cache_nbytes
         self.worker: Optional[SlicePrefetchWorker] = None
         self.current_axis = 0
         self.current_idx = 0
+        
+        # One worker thread serves all prefetch requests until cleanup()
+        self._start_worker()
+    
+    def _start_worker(self):
+        """Create the worker, open the H5 file once and start the thread."""
+        self.worker = SlicePrefetchWorker(self.h5_file_path, self.dataset_key,
+                                          rdcc_nbytes=self.rdcc_nbytes,
+                                          cache=self.cache,
+                                          parallel_io=self.parallel_io,
+                                          zslab_cache_nbytes=self.zslab_cache_nbytes)
+        self.worker.open_file()
+        
+        # Connect signals
+        self.worker.slices_prefetched.connect(self._on_prefetched_batch)
+        self.worker.slice_ready.connect(self._on_ready)
+        self.worker.prefetch_error.connect(self._on_error)
+        self.worker.slice_ready.connect(self.slice_ready)
+        self.worker.prefetch_error.connect(self.prefetch_error)
+        
+        # A running QThread must not be destroyed: stop the worker with its
+        # owner, when the application quits or at interpreter exit, even if
+        # cleanup() is never called
+        worker = self.worker
+        _live_workers.add(worker)
+        self.destroyed.connect(lambda *_: _stop_worker(worker))
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.cleanup)
+        
+        self.worker.start()  # This will call run()
     
     def start_prefetching(self, axis: int, current_idx: int, prefetch_range: int = 2):
         """
         Start prefetching neighboring slices.
         
+        With a shared cache on a chunked dataset, the rest of the chunk
+        containing current_idx is prefetched, plus the next chunk in the
+        scroll direction once current_idx nears its boundary, so each chunk
+        is decompressed once. The worker keeps only as many slices as the
+        cache holds, nearest first, and skips slices already cached. Without
+        a cache nothing tracks what was delivered, so only the +/-
+        prefetch_range window is sent.
+        
         Args:
             axis: Current axis.
             current_idx: Current slice index.
             prefetch_range: Prefetch range (prefetch N slices before and after).
         """
-        # Stop any previous prefetch
-        self.stop_prefetching()
+        if self.worker is None:
+            self._start_worker()
+        
+        chunks = self.worker.chunks
+        chunk_len = chunks[axis] if chunks is not None else 1
         
-        # Build prefetch list (prioritize +1, +2, then -1, -2)
-        prefetch_list = []
-        for i in range(1, prefetch_range + 1):
-            prefetch_list.append(i)   # forward
-            prefetch_list.append(-i)  # backward
+        if self.cache is not None and 1 < chunk_len <= _MAX_CHUNK_PREFETCH:
+            # Scroll direction relative to the previous request on this axis
+            backward = axis == self.current_axis and current_idx < self.current_idx
+            prefetch_ranges = _chunk_aligned_ranges(current_idx, chunk_len,
+                                                    -1 if backward else 1,
+                                                    prefetch_range)
+        else:
+            # Build prefetch list and merge it into consecutive ranges
+            # (prioritize +1..+N, then -1..-N), each read with one HDF5 call
+            prefetch_list = []
+            for i in range(1, prefetch_range + 1):
+                prefetch_list.append(i)   # forward
+                prefetch_list.append(-i)  # backward
+            prefetch_ranges = _coalesce_offsets(current_idx, prefetch_list)
         
         # Update current state
         self.current_axis = axis
         self.current_idx = current_idx
         
-        # Create a new worker thread
-        self.worker = SlicePrefetchWorker(self.h5_file_path, self.dataset_key)
-        self.worker.open_file()
-        
-        # Connect signals
-        self.worker.slice_prefetched.connect(self._on_prefetched)
-        self.worker.prefetch_error.connect(self._on_error)
-        
-        # Set prefetch parameters and start the thread
-        self.worker.axis = axis
-        self.worker.current_idx = current_idx
-        self.worker.prefetch_list = prefetch_list
-        self.worker.start()  # This will call run()
+        # Hand the request to the running worker (cancels any previous one)
+        self.worker.submit(axis, current_idx, prefetch_ranges)
     
     def stop_prefetching(self):
-        """Stop prefetching."""
+        """Stop prefetching (the worker thread stays alive)."""
         if self.worker is not None:
             self.worker.stop()
-            self.worker.quit()
-            self.worker.wait(1000)  # Wait up to 1 second for the thread to finish
-            self.worker.close_file()
-            self.worker = None
+    
+    def _on_prefetched_batch(self, axis: int, slice_indices: np.ndarray, block: np.ndarray):
+        """Split a prefetched range (planes stacked along the first axis) into per-slice callbacks."""
+        forward = self.isSignalConnected(QMetaMethod.fromSignal(self.slice_prefetched))
+        for k, slice_idx in enumerate(slice_indices.tolist()):
+            self._on_prefetched(axis, slice_idx, block[k])
+            if forward:
+                self.slice_prefetched.emit(axis, slice_idx, np.array(block[k]))
     
     def _on_prefetched(self, axis: int, slice_idx: int, data: np.ndarray):
         """Callback when a slice has been prefetched (override in subclass if needed)."""
         pass
     
+    def _on_ready(self, axis: int, slice_idx: int):
+        """Callback when a slice has been put into the shared cache (override in subclass if needed)."""
+        pass
+    
     def _on_error(self, error_msg: str):
         """Callback when a prefetch error occurs (override in subclass if needed)."""
         print(f"Prefetch error: {error_msg}")
     
     def cleanup(self):
-        """Clean up resources."""
-        self.stop_prefetching()
+        """Clean up resources: stop the worker thread and close the H5 file."""
+        if self.worker is not None:
+            _stop_worker(self.worker)
+            self.worker = None